@@ -1,9 +1,34 @@
-import json
-import re
-from typing import Dict, Optional
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Tuple, Type
 import requests
+from requests.adapters import HTTPAdapter
 import cloudscraper
 
+# orjson is an optional, faster drop-in for decoding event payloads
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json  # type: ignore[no-redef]
+
+# Literals used while scanning the chat event stream
+_DATA_PREFIX = b'data: '
+_DATA_PREFIX_LEN = len(_DATA_PREFIX)
+_EVENT_PREFIX = b'event:'
+_EVENT_PREFIX_LEN = len(_EVENT_PREFIX)
+_TEXT_KEY = 'text'
+_SID_KEY = 'sid'
+_TYPE_KEY = 'type'
+_TEXT_MARKER = b'"text":"'
+_SID_MARKER = b'"sid":"'
+_TYPE_MARKER = b'"type":"'
+
+# Query parameters shared by every audio request
+_BASE_AUDIO_PARAMS: Dict[str, str] = {'mode': 'eager'}
+
 class PiAIError(Exception):
     """Base exception for PiAI-related errors."""
     pass
@@ -32,6 +57,18 @@ class PiAIClient:
     with robust error handling and configurable parameters.
     """
 
+    __slots__ = (
+        '_session',
+        '_cloudscraper',
+        '_cloudscraper_lock',
+        '_base_url',
+        '_host_session',
+        '_cf_bm',
+        '_timeout',
+        '_conversation_id',
+        '_pool'
+    )
+
     # Define voice constants as a class-level attribute
     AVAILABLE_VOICES: Dict[str, int] = {
         "William": 1,
@@ -42,6 +79,20 @@ class PiAIClient:
         "Harry": 6
     }
 
+    # Precomputed 'voice' query parameter for each available voice
+    _VOICE_PARAM: Dict[str, str] = {
+        name: f"voice{index}" for name, index in AVAILABLE_VOICES.items()
+    }
+
+    # Payload types and server-sent event names that mark the end of a
+    # chat response
+    _TERMINAL_TYPES = frozenset({'completed'})
+    _TERMINAL_EVENTS = frozenset({b'complete', b'completed'})
+
+    # Keep-alive connection pool sizing for the underlying session
+    POOL_CONNECTIONS: int = 4
+    POOL_MAXSIZE: int = 8
+
     def __init__(
         self, 
         host_session: str, 
@@ -63,20 +114,145 @@ class PiAIClient:
         """
         self._validate_session_parameters(host_session, conversation_id)
 
-        self._scraper = cloudscraper.create_scraper()
+        # cloudscraper is only set up once Cloudflare actually challenges us
+        self._session = requests.Session()
+        self._cloudscraper: Optional[cloudscraper.CloudScraper] = None
+        self._cloudscraper_lock = threading.Lock()
         self._base_url = 'https://pi.ai/api/chat'
         self._host_session = host_session
         self._cf_bm = cf_bm
         self._timeout = timeout
-        
-        self._headers = self._create_headers()
-        self._cookies = {
-            '__Host-session': self._host_session,
-            '__cf_bm': self._cf_bm
-        }
 
         self._conversation_id = conversation_id
 
+        self._configure_session()
+        self._pool = ThreadPoolExecutor(max_workers=2)
+
+    def __enter__(self) -> "PiAIClient":
+        """
+        Enter the client context.
+
+        Returns:
+            PiAIClient: The client instance
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        """
+        Exit the client context and close the underlying session.
+        """
+        self.close()
+
+    @property
+    def _scraper(self) -> requests.Session:
+        """
+        Session used for API requests: the cloudscraper session once a
+        Cloudflare challenge has been seen, the plain session otherwise.
+
+        Returns:
+            requests.Session: Active request session
+        """
+        return self._cloudscraper or self._session
+
+    def _configure_session(self) -> None:
+        """
+        Attach headers and cookies to the session and size its keep-alive
+        connection pool so chat and audio requests reuse the same connection.
+        """
+        self._session.headers.update(self._create_headers())
+        self._session.cookies.update(self._create_cookies())
+        self._resize_pool(self._session)
+
+    def _resize_pool(self, session: requests.Session) -> None:
+        """
+        Resize the keep-alive connection pool of a session's HTTPS adapter.
+
+        The adapter already mounted is resized instead of replaced, so the
+        Cloudflare-friendly TLS setup of cloudscraper's adapter is preserved.
+
+        Args:
+            session (requests.Session): Session whose adapter to resize
+        """
+        adapter = session.get_adapter(self._base_url)
+        if isinstance(adapter, HTTPAdapter):
+            adapter.init_poolmanager(self.POOL_CONNECTIONS, self.POOL_MAXSIZE)
+
+    def _enable_cloudscraper(self) -> None:
+        """
+        Switch subsequent requests to a cloudscraper session carrying the
+        plain session's cookies and the client's headers.
+
+        The headers are merged into cloudscraper's own browser profile rather
+        than replacing it, so its remaining profile headers are kept. Safe to
+        call from the audio worker threads; the session is only created once.
+        """
+        with self._cloudscraper_lock:
+            if self._cloudscraper is not None:
+                return
+            scraper = cloudscraper.create_scraper()
+            scraper.headers.update(self._create_headers())
+            scraper.cookies.update(self._session.cookies)
+            self._resize_pool(scraper)
+            self._cloudscraper = scraper
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request on the active session. If the plain session gets a
+        Cloudflare challenge, switch to cloudscraper and retry once.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Extra arguments passed to ``requests.Session.request``
+
+        Returns:
+            requests.Response: API response, possibly still a challenge
+        """
+        session = self._scraper
+        response = session.request(method, url, **kwargs)
+
+        if session is self._session and self._is_cloudflare_challenge(response):
+            response.close()
+            self._enable_cloudscraper()
+            response = self._scraper.request(method, url, **kwargs)
+
+        return response
+
+    def _is_cloudflare_challenge(self, response: requests.Response) -> bool:
+        """
+        Check whether a response is a Cloudflare challenge page rather than
+        an answer from Pi AI itself.
+
+        Args:
+            response (requests.Response): API response to inspect
+
+        Returns:
+            bool: True if Cloudflare challenged the request
+        """
+        if response.status_code not in (403, 503):
+            return False
+        if not response.headers.get('Server', '').startswith('cloudflare'):
+            return False
+        return (
+            response.headers.get('cf-mitigated') == 'challenge' or 
+            b'/cdn-cgi/challenge-platform/' in response.content
+        )
+
+    def close(self) -> None:
+        """
+        Close the underlying sessions, release pooled connections and stop
+        the audio download worker threads.
+        """
+        self._pool.shutdown(wait=True)
+        if self._cloudscraper is not None:
+            self._cloudscraper.close()
+        self._session.close()
+
     def _validate_session_parameters(
         self, 
         host_session: str, 
@@ -111,6 +287,18 @@ class PiAIClient:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
 
+    def _create_cookies(self) -> Dict[str, str]:
+        """
+        Create the session cookies for API requests.
+
+        Returns:
+            Dict[str, str]: Configured request cookies
+        """
+        return {
+            '__Host-session': self._host_session,
+            '__cf_bm': self._cf_bm
+        }
+
     def chat(
         self, 
         prompt: str, 
@@ -134,6 +322,7 @@ class PiAIClient:
             VoiceNotFoundError: If an invalid voice is specified
             SessionExpiredError: If the session has expired
             APIConnectionError: For network or API communication issues
+            AudioDownloadError: If the audio response cannot be downloaded
         """
         self._validate_voice(voice_name)
 
@@ -168,21 +357,30 @@ class PiAIClient:
 
         Returns:
             requests.Response: API response
+
+        Raises:
+            SessionExpiredError: If the session has expired
+            APIConnectionError: If Cloudflare keeps challenging the request
         """
         request_data = {
             'text': prompt,
             'conversation': self._conversation_id
         }
 
-        response = self._scraper.post(
+        response = self._request(
+            'POST', 
             self._base_url, 
-            headers=self._headers, 
-            cookies=self._cookies, 
             json=request_data, 
             stream=True, 
             timeout=self._timeout
         )
 
+        # A challenge cloudscraper could not solve is a connection problem,
+        # not an expired session
+        if self._is_cloudflare_challenge(response):
+            response.close()
+            raise APIConnectionError("Cloudflare challenge could not be solved.")
+
         if response.status_code in (401, 403):
             raise SessionExpiredError("Session expired. Please update credentials.")
 
@@ -206,84 +404,249 @@ class PiAIClient:
 
         Returns:
             str: Processed text response
+
+        Raises:
+            AudioDownloadError: If the background audio download fails
         """
-        output_str = response.content.decode('utf-8')
-        sids = re.findall(r'"sid":"(.*?)"', output_str)
-        second_sid = sids[1] if len(sids) >= 2 else None
+        abort_audio = threading.Event()
+        streaming_text, audio_future = self._parse_event_stream(
+            response, voice_name, output_file, abort_audio
+        )
 
-        streaming_text = self._extract_streaming_text(output_str)
-        
-        self._download_audio_threaded(voice_name, second_sid, verbose, output_file)
+        if audio_future is not None:
+            # Re-raises AudioDownloadError from the worker thread. No overall
+            # deadline: the request timeout already bounds every read, and
+            # eager audio can legitimately stream for longer than that.
+            try:
+                audio_future.result()
+            except BaseException:
+                abort_audio.set()
+                raise
+
+            if verbose:
+                print("\033[1;92mAudio file downloaded successfully.\033[0m")
         
         return streaming_text
 
-    def _extract_streaming_text(self, output_str: str) -> str:
+    def _parse_event_stream(
+        self, 
+        response: requests.Response, 
+        voice_name: str, 
+        output_file: str, 
+        abort_audio: threading.Event
+    ) -> Tuple[str, Optional[Future]]:
         """
-        Extract streaming text from the API response.
+        Incrementally parse the server-sent event stream of a chat response.
+
+        Each ``data:`` event is decoded as it arrives, accumulating the text
+        fragments. As soon as the second message sid is seen, the audio
+        download is dispatched to a worker thread so it overlaps with the
+        rest of the stream. Once that download has started, parsing stops
+        after the data of the terminal event (a ``"type":"completed"``
+        payload or a ``complete``/``completed`` event) and the rest of the
+        body is drained.
 
         Args:
-            output_str (str): Raw API response string
+            response (requests.Response): Streaming API response to parse
+            voice_name (str): Selected voice for audio
+            output_file (str): Path to save audio response
+            abort_audio (threading.Event): Set to stop the audio download early
 
         Returns:
-            str: Extracted text response
+            Tuple[str, Optional[Future]]: Text response and the pending audio download, if any
         """
-        streaming_text = ""
-        for line in output_str.splitlines():
-            try:
-                modified_line = re.sub("data: ", "", line)
-                parsed_data = json.loads(modified_line)
-                if 'text' in parsed_data:
-                    streaming_text += parsed_data['text']
-            except (json.JSONDecodeError, KeyError):
-                continue
-        return streaming_text
+        chunks: List[str] = []
+        sid_count = 0
+        audio_future = None
+        in_terminal_event = False
+
+        try:
+            for line in response.iter_lines(chunk_size=8192):
+                # Blank lines are not used to find event boundaries: with CRLF
+                # line endings iter_lines can emit a spurious one when '\r'
+                # and '\n' land in different chunks.
+                if line.startswith(_EVENT_PREFIX):
+                    in_terminal_event = (
+                        line[_EVENT_PREFIX_LEN:].strip() in self._TERMINAL_EVENTS
+                    )
+                    continue
+                if not line.startswith(_DATA_PREFIX):
+                    continue
+
+                text, sid, event_type = self._parse_event(line[_DATA_PREFIX_LEN:])
+                if text:
+                    chunks.append(text)
+                if sid is not None and sid_count < 2:
+                    sid_count += 1
+                    # An empty second sid means there is no audio to fetch
+                    if sid_count == 2 and sid:
+                        audio_future = self._pool.submit(
+                            self._download_audio_threaded, 
+                            voice_name, sid, output_file, abort_audio
+                        )
+
+                # Nothing useful follows the terminal event once the audio sid
+                # is known, so drain the trailing frames unparsed, which lets
+                # the connection go back to the pool.
+                if in_terminal_event or event_type in self._TERMINAL_TYPES:
+                    if audio_future is not None:
+                        for _ in response.iter_content(chunk_size=8192):
+                            pass
+                        break
+                    in_terminal_event = False
+        except BaseException:
+            # Stop the download of a failed chat; it never touches output_file
+            abort_audio.set()
+            raise
+        finally:
+            response.close()
+
+        return ''.join(chunks), audio_future
+
+    def _parse_event(
+        self, 
+        payload: bytes
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Extract the text fragment, message sid and type of a single event payload.
+
+        Flat payloads (a single object, no nesting) are read straight from the
+        raw bytes, since a marker there can only be a top-level key. Nested
+        payloads, or fields in a form the scanner does not handle, fall back
+        to a full JSON decode, using orjson when it is installed.
+
+        Args:
+            payload (bytes): Raw JSON payload of a ``data:`` event
+
+        Returns:
+            Tuple[Optional[str], Optional[str], Optional[str]]: Text fragment,
+            sid and event type, if present
+        """
+        try:
+            if payload.count(b'{') == 1:
+                text = self._read_string_field(payload, _TEXT_MARKER)
+                sid = self._read_string_field(payload, _SID_MARKER)
+                event_type = self._read_string_field(payload, _TYPE_MARKER)
+                if ((text is not None or b'"text"' not in payload) and 
+                        (sid is not None or b'"sid"' not in payload) and 
+                        (event_type is not None or b'"type"' not in payload)):
+                    return text, sid, event_type
+
+            parsed_data = _json.loads(payload)
+        except ValueError:
+            return None, None, None
+
+        if not isinstance(parsed_data, dict):
+            return None, None, None
+        return (
+            parsed_data.get(_TEXT_KEY), 
+            parsed_data.get(_SID_KEY), 
+            parsed_data.get(_TYPE_KEY)
+        )
+
+    def _read_string_field(self, payload: bytes, marker: bytes) -> Optional[str]:
+        """
+        Read a JSON string value that directly follows ``marker`` in a payload.
+
+        The value ends at the first quote not escaped by an odd run of
+        backslashes. Values containing escapes are unescaped with the JSON
+        decoder; all others are decoded as UTF-8 directly.
+
+        Args:
+            payload (bytes): Raw JSON payload of a ``data:`` event
+            marker (bytes): Key and opening quote, e.g. ``b'"text":"'``
+
+        Returns:
+            Optional[str]: Decoded value, or None if the marker is not found
+
+        Raises:
+            ValueError: If the value is not valid UTF-8 or JSON
+        """
+        start = payload.find(marker)
+        if start == -1:
+            return None
+        start += len(marker)
+
+        end = payload.find(b'"', start)
+        while end != -1:
+            backslashes = 0
+            while end - backslashes > start and payload[end - backslashes - 1] == 0x5C:
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            end = payload.find(b'"', end + 1)
+        if end == -1:
+            return None
+
+        value = payload[start:end]
+        if b'\\' in value:
+            return _json.loads(b'"' + value + b'"')
+        return value.decode('utf-8')
 
     def _download_audio_threaded(
         self, 
         voice_name: str, 
         message_sid: Optional[str], 
-        verbose: bool, 
-        output_file: str
+        output_file: str, 
+        abort: threading.Event
     ) -> None:
         """
-        Download audio response in a separate thread.
+        Download audio response. Runs on the client's worker thread pool;
+        errors reach the caller through the returned future.
+
+        The audio is written to a temporary file next to ``output_file`` and
+        only moved into place once complete, so an aborted or failed download
+        never leaves a partial file behind.
 
         Args:
             voice_name (str): Selected voice name
             message_sid (Optional[str]): Message identifier for audio
-            verbose (bool): Enable detailed logging
             output_file (str): Path to save audio file
+            abort (threading.Event): Stops the download when set
 
         Raises:
-            AudioDownloadError: If audio download fails
+            AudioDownloadError: If audio download fails or is aborted
         """
         if not message_sid:
             return
 
         params = {
-            'mode': 'eager',
-            'voice': f'voice{self.AVAILABLE_VOICES[voice_name]}',
+            **_BASE_AUDIO_PARAMS,
+            'voice': self._VOICE_PARAM[voice_name],
             'messageSid': message_sid,
         }
 
+        temp_file = f"{output_file}.{uuid.uuid4().hex}.part"
         try:
-            audio_response = self._scraper.get(
+            audio_response = self._request(
+                'GET', 
                 'https://pi.ai/api/chat/voice', 
                 params=params, 
-                cookies=self._cookies, 
-                headers=self._headers, 
+                stream=True, 
                 timeout=self._timeout
             )
-            audio_response.raise_for_status()
+            if self._is_cloudflare_challenge(audio_response):
+                audio_response.close()
+                raise AudioDownloadError("Cloudflare challenge could not be solved.")
 
-            with open(output_file, "wb") as file:
-                file.write(audio_response.content)
+            with audio_response:
+                audio_response.raise_for_status()
 
-            if verbose:
-                print("\033[1;92mAudio file downloaded successfully.\033[0m")
+                with open(temp_file, "xb") as file:
+                    for chunk in audio_response.iter_content(chunk_size=65536):
+                        if abort.is_set():
+                            raise AudioDownloadError("Audio download aborted.")
+                        file.write(chunk)
+
+            if abort.is_set():
+                raise AudioDownloadError("Audio download aborted.")
+            os.replace(temp_file, output_file)
 
         except requests.exceptions.RequestException as e:
             raise AudioDownloadError(f"Failed to download audio: {e}")
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
 
 # Example usage
 def main():